@@ -1,6 +1,16 @@
 from fastmcp import Client
 import asyncio
 
+async def call_many(client, specs):
+    """Run independent tool calls concurrently.
+
+    `specs` is a list of (tool_name, arguments) pairs. Only batch calls that do
+    not depend on each other: `get_screenshot`, `get_status` and `list_sessions`
+    are side-effect-free and safe to gather, except `get_screenshot` with
+    `delta=True`, which advances the session's delta baseline.
+    """
+    return await asyncio.gather(*(client.call_tool(name, args) for name, args in specs))
+
 async def main():
     async with Client("http://localhost:8000/mcp") as client:
         tools = await client.list_tools()
@@ -1,18 +1,29 @@
 """
 Computer Use MCP: Virtual computer control through MCP.
 """
+import asyncio
 import os
 from dotenv import load_dotenv
 import base64
 import logging
 import sys
-from typing import Dict, List, Optional, Any
+import threading
+from io import BytesIO
+from typing import Annotated, Dict, List, Literal, Optional, Any, Tuple, Union
 from pydantic import BaseModel, Field
+from PIL import Image
+import lz4.frame
+import numpy as np
+import xxhash
 
 from fastmcp import FastMCP, Context
+from mcp.types import ImageContent
+from fastmcp.server.middleware import Middleware
 
 load_dotenv()
 
+ANTHROPIC_KEY_PRESENT = bool(os.environ.get("ANTHROPIC_API_KEY"))
+
 # Configure logging to stdout
 logging.basicConfig(
     stream=sys.stdout,
@@ -21,6 +32,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Import the Orgo SDK once; a missing or broken install is reported by
+# initialize_computer instead of stopping the server from starting.
+try:
+    from orgo import Computer
+    ORGO_IMPORT_ERROR = None
+except ImportError:
+    Computer = None
+    ORGO_IMPORT_ERROR = "Orgo SDK not installed. Run: pip install orgo"
+except Exception as e:
+    Computer = None
+    ORGO_IMPORT_ERROR = f"Orgo SDK failed to import: {str(e)}"
+    logger.error(ORGO_IMPORT_ERROR)
+
 # Initialize FastMCP server
 mcp = FastMCP(name="Orgo MCP 🖥️")
 
@@ -30,32 +54,267 @@ class ComputerConfig(BaseModel):
     display_width: int = Field(1024, description="Display width in pixels")
     display_height: int = Field(768, description="Display height in pixels")
 
+# Input actions for action_sequence, discriminated on "type"
+class ClickAction(BaseModel):
+    type: Literal["click", "right_click", "double_click"]
+    x: int = Field(description="X coordinate")
+    y: int = Field(description="Y coordinate")
+
+    def perform(self, computer):
+        method = "left_click" if self.type == "click" else self.type
+        return getattr(computer, method)(self.x, self.y)
+
+class ScrollAction(BaseModel):
+    type: Literal["scroll"]
+    direction: str = Field("down", description="Scroll direction")
+    amount: int = Field(1, description="Scroll amount")
+
+    def perform(self, computer):
+        return computer.scroll(self.direction, self.amount)
+
+class TypeAction(BaseModel):
+    type: Literal["type"]
+    text: str = Field(description="Text to type")
+
+    def perform(self, computer):
+        return computer.type(self.text)
+
+class KeyAction(BaseModel):
+    type: Literal["key"]
+    key: str = Field(description="Key or key combination, e.g. 'Enter' or 'ctrl+c'")
+
+    def perform(self, computer):
+        return computer.key(self.key)
+
+Action = Annotated[Union[ClickAction, ScrollAction, TypeAction, KeyAction], Field(discriminator="type")]
+
 # Computer Registry
 class ComputerRegistry:
+    """Session registry safe to use from worker threads.
+
+    Writes copy the dict under a lock and swap it in, so reads never lock and
+    never observe a half-applied update.
+    """
     def __init__(self):
         self.computers = {}
+        self.last_frame_tiles = {}
         self.default_session = "default"
+        self._lock = threading.Lock()
+        self._sessions = ()
     
     def get(self, session_id: Optional[str] = None):
         session_id = session_id or self.default_session
-        if session_id not in self.computers:
+        computer = self.computers.get(session_id)
+        if computer is None:
             raise ValueError(f"No computer found for session '{session_id}'. Initialize one first.")
-        return self.computers[session_id]
+        return computer
     
     def add(self, computer, session_id: Optional[str] = None):
         session_id = session_id or self.default_session
-        self.computers[session_id] = computer
+        with self._lock:
+            computers = dict(self.computers)
+            computers[session_id] = computer
+            self.last_frame_tiles.pop(session_id, None)
+            self.computers, self._sessions = computers, tuple(computers)
         return session_id
     
     def remove(self, session_id: Optional[str] = None) -> bool:
         session_id = session_id or self.default_session
-        return bool(self.computers.pop(session_id, None))
+        with self._lock:
+            computers = dict(self.computers)
+            removed = computers.pop(session_id, None)
+            self.last_frame_tiles.pop(session_id, None)
+            self.computers, self._sessions = computers, tuple(computers)
+        return bool(removed)
+    
+    def list_sessions(self) -> Tuple[str, ...]:
+        return self._sessions
     
-    def list_sessions(self) -> List[str]:
-        return list(self.computers.keys())
+    def swap_frame_tiles(self, session_id: str, frame, keyframe: bool = False):
+        """Store a session's latest delta frame and return the previous one.
+
+        With keyframe=True the previous frame is discarded and None returned.
+        """
+        with self._lock:
+            previous = self.last_frame_tiles.get(session_id)
+            self.last_frame_tiles[session_id] = frame
+        return None if keyframe else previous
 
 registry = ComputerRegistry()
 
+# Screenshot encoding
+# Favour encode speed over file size: Pillow's wheels ship libjpeg-turbo, and
+# skipping the optimize/progressive passes avoids extra Huffman/scan work.
+ENCODE_OPTIONS = {
+    "jpeg": {"format": "JPEG", "quality": 85, "subsampling": 2, "optimize": False, "progressive": False},
+    "webp": {"format": "WEBP", "quality": 85, "method": 0},
+}
+
+_scratch = threading.local()
+
+def encode_image_base64(image, format: str = "jpeg", **options) -> str:
+    """Encode a PIL image as base64 JPEG or WebP, reusing a per-thread buffer.
+
+    `options` override the ENCODE_OPTIONS defaults for the format.
+    """
+    buffer = getattr(_scratch, "buffer", None)
+    if buffer is None:
+        buffer = _scratch.buffer = BytesIO()
+    buffer.seek(0)
+    buffer.truncate(0)
+    image.save(buffer, **{**ENCODE_OPTIONS[format], **options})
+    # Encode straight from the buffer instead of copying it out with getvalue();
+    # the view must be released before the buffer can be truncated again.
+    with buffer.getbuffer() as view:
+        return base64.b64encode(view).decode("utf-8")
+
+def downscale(image, max_dim: int):
+    """Shrink an image so its longest side is at most max_dim pixels."""
+    if max_dim <= 0:
+        raise ValueError("max_dim must be a positive number of pixels")
+    scale = max_dim / max(image.size)
+    if scale >= 1:
+        return image
+    # Bilinear is several times cheaper than Lanczos and plenty for vision models
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    return image.resize(size, Image.BILINEAR)
+
+# Base64 prefixes of the image signatures MCP clients reliably render
+IMAGE_SIGNATURES = {
+    "/9j/": "image/jpeg",
+    "iVBORw0KGgo": "image/png",
+    "UklGR": "image/webp",
+}
+
+def image_mime_type(image_data: str) -> Optional[str]:
+    """Detect the MIME type of base64 image data from its magic bytes."""
+    for prefix, mime_type in IMAGE_SIGNATURES.items():
+        if image_data.startswith(prefix):
+            return mime_type
+    return None
+
+def decode_image_base64(image_data: str):
+    """Decode base64 image data into a PIL image."""
+    return Image.open(BytesIO(base64.b64decode(image_data)))
+
+def compress_raw_base64(image) -> str:
+    """Compress the raw pixels of an RGB image with LZ4 and return them as base64."""
+    raw = image.tobytes()
+    return base64.b64encode(lz4.frame.compress(raw, compression_level=0)).decode("utf-8")
+
+TILE_SIZE = 64
+
+def tile_hashes(pixels):
+    """Hash each TILE_SIZE x TILE_SIZE tile of an (H, W, 3) uint8 array.
+
+    Returns a (rows, cols) uint64 array; edge tiles are zero-padded.
+    """
+    height, width = pixels.shape[:2]
+    rows, cols = -(-height // TILE_SIZE), -(-width // TILE_SIZE)
+    padded = np.pad(pixels, ((0, rows * TILE_SIZE - height), (0, cols * TILE_SIZE - width), (0, 0)))
+    # One copy into a C-contiguous (ntiles, tile_bytes) array lets xxh3 read
+    # each tile through a memoryview instead of materialising it with tobytes().
+    tiles = np.ascontiguousarray(
+        padded.reshape(rows, TILE_SIZE, cols, TILE_SIZE, 3).swapaxes(1, 2)
+    ).reshape(rows * cols, -1)
+    hash_tile = xxhash.xxh3_64_intdigest
+    hashes = np.fromiter((hash_tile(memoryview(tile)) for tile in tiles), dtype=np.uint64, count=rows * cols)
+    return hashes.reshape(rows, cols)
+
+def encode_delta(
+    image,
+    session_id: str,
+    format: str = "jpeg",
+    options: Optional[Dict[str, Any]] = None,
+    keyframe: bool = False
+) -> Dict[str, Any]:
+    """Encode only the RGB image tiles that changed since the session's last delta frame."""
+    options = options or {}
+    hashes = tile_hashes(np.asarray(image))
+    previous = registry.swap_frame_tiles(session_id, (image.size, hashes), keyframe)
+    
+    # Compare frame sizes, not grid shapes: sizes that round up to the same
+    # number of tiles would otherwise be diffed against each other.
+    if previous is None or previous[0] != image.size:
+        return {
+            "full": True,
+            "format": format,
+            "image": encode_image_base64(image, format, **options),
+            "width": image.width,
+            "height": image.height
+        }
+    
+    tiles = []
+    for row, col in zip(*np.nonzero(hashes != previous[1])):
+        x, y = int(col) * TILE_SIZE, int(row) * TILE_SIZE
+        tile = image.crop((x, y, min(x + TILE_SIZE, image.width), min(y + TILE_SIZE, image.height)))
+        tiles.append({"x": x, "y": y, "image": encode_image_base64(tile, format, **options)})
+    return {"full": False, "format": format, "tiles": tiles}
+
+# Tool list cache
+class ToolListCache(Middleware):
+    """Serve tools/list from memory once the tool set has been built.
+
+    All tools are registered at import time, so the list (and its JSON schemas)
+    never changes while the server is running. The cached list is shared by
+    every client: it bypasses FastMCP's per-request session transforms,
+    enabled checks and auth filtering. That is only safe while this server
+    defines no auth or visibility rules; remove this middleware if it does.
+    """
+    def __init__(self):
+        self._tools = None
+
+    async def on_list_tools(self, context, call_next):
+        if self._tools is None:
+            self._tools = await call_next(context)
+        return self._tools
+
+mcp.add_middleware(ToolListCache())
+
+# HTTP connection pooling
+HTTP_POOL_SIZE = 32
+
+def pool_http_connections(computer) -> None:
+    """Size the SDK's keep-alive pool for concurrent tool calls.
+
+    The Orgo SDK already reuses a requests.Session, but its default pool keeps
+    only 10 connections per host, so parallel calls from worker threads beyond
+    that open (and discard) fresh TLS connections.
+    """
+    session = getattr(getattr(computer, "api", None), "session", None)
+    if session is None or not hasattr(session, "mount"):
+        return
+    from requests.adapters import HTTPAdapter
+    adapter = HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+# Progress logging
+def truncate(text: str, limit: int) -> str:
+    """Shorten text for log messages."""
+    return text if len(text) <= limit else f"{text[:limit]}..."
+
+async def log_info(ctx: Optional[Context], message: str) -> None:
+    """Send an info message to the client, if there is one."""
+    if ctx:
+        await ctx.info(message)
+
+async def log_debug(ctx: Optional[Context], message: str) -> None:
+    """Send a debug message to the client, if there is one."""
+    if ctx:
+        await ctx.debug(message)
+
+async def run_action(ctx: Optional[Context], message: str, error: str, func, *args, log=log_info):
+    """Log `message`, run a blocking SDK call in a worker thread and report failures."""
+    await log(ctx, message)
+    
+    try:
+        return await asyncio.to_thread(func, *args)
+    except Exception as e:
+        if ctx:
+            await ctx.error(f"{error}: {str(e)}")
+        raise ValueError(f"{error}: {str(e)}")
+
 # Core Tools
 @mcp.tool()
 async def initialize_computer(
@@ -66,28 +325,26 @@ async def initialize_computer(
     ctx: Optional[Context] = None
 ) -> Dict[str, Any]:
     """Initialize a virtual computer with the provided API key."""
-    if ctx:
-        await ctx.info(f"Initializing computer for session: {session_id or 'default'}")
+    await log_info(ctx, f"Initializing computer for session: {session_id or 'default'}")
     
-    try:
-        from orgo import Computer
-    except ImportError:
+    if Computer is None:
         if ctx:
-            await ctx.error("Orgo SDK not installed. Run: pip install orgo")
-        raise ValueError("Orgo SDK not installed")
+            await ctx.error(ORGO_IMPORT_ERROR)
+        raise ValueError(ORGO_IMPORT_ERROR)
     
     try:
-        computer = Computer(
+        computer = await asyncio.to_thread(
+            Computer,
             project_id=project_id,
             base_api_url=base_api_url,
             config=config
         )
         
+        pool_http_connections(computer)
         session_id = registry.add(computer, session_id)
-        status = computer.status()
+        status = await asyncio.to_thread(computer.status)
         
-        if ctx:
-            await ctx.info(f"Computer initialized with project ID: {computer.project_id}")
+        await log_info(ctx, f"Computer initialized with project ID: {computer.project_id}")
         
         return {
             "session_id": session_id,
@@ -100,25 +357,87 @@ async def initialize_computer(
         raise ValueError(f"Computer initialization failed: {str(e)}")
 
 @mcp.tool()
-async def get_screenshot(session_id: Optional[str] = None, ctx: Optional[Context] = None) -> Dict[str, str]:
-    """Take a screenshot of the virtual computer's display."""
+async def get_screenshot(
+    session_id: Optional[str] = None,
+    format: Optional[Literal["jpeg", "webp", "lz4_raw"]] = None,
+    delta: bool = False,
+    keyframe: bool = False,
+    quality: Optional[Annotated[int, Field(ge=1, le=95)]] = None,
+    subsampling: Optional[Literal[0, 1, 2]] = None,
+    max_dim: Optional[int] = None,
+    ctx: Optional[Context] = None
+) -> Union[ImageContent, Dict[str, Any]]:
+    """Take a screenshot of the virtual computer's display.
+
+    By default the SDK's image is passed through as-is (often PNG); set
+    format to re-encode it. Returns image content, except for "lz4_raw"
+    which returns LZ4-framed RGB pixels plus width/height for cheap encoding
+    on local transports. Use "webp" for smaller payloads over remote links.
+
+    With delta=True, returns only the 64x64 JPEG or WebP tiles that changed
+    since the previous delta screenshot of this session ("full": False), or
+    the whole frame when there is nothing to compare against or keyframe=True
+    ("full": True). Use keyframe=True to resynchronise after reconnecting.
+
+    quality (1-95, default 85) and JPEG chroma subsampling (0 = 4:4:4,
+    1 = 4:2:2, 2 = 4:2:0, the default) re-encode the frame; use subsampling=0
+    when small text must stay legible for OCR.
+
+    max_dim downscales the frame so its longest side fits, which cuts encode
+    work and vision tokens. Coordinates in the result are then scaled by
+    max_dim / max(width, height) relative to the display.
+    """
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info("Taking screenshot...")
+    if delta and format == "lz4_raw":
+        raise ValueError("Delta screenshots support jpeg and webp tiles only")
+    if max_dim is not None and max_dim <= 0:
+        raise ValueError("max_dim must be a positive number of pixels")
+    await log_info(ctx, "Taking screenshot...")
+    
+    options = {}
+    if quality is not None:
+        options["quality"] = quality
+    if subsampling is not None and format in (None, "jpeg"):
+        options["subsampling"] = subsampling
     
     try:
-        image_data = computer.screenshot_base64()
-        
-        if not image_data:
-            if ctx:
+        screenshot = None
+        if format is None and not delta and not options and max_dim is None:
+            image_data = await asyncio.to_thread(computer.screenshot_base64)
+            mime_type = image_data and image_mime_type(image_data)
+            if mime_type:
+                return ImageContent(type="image", data=image_data, mimeType=mime_type)
+            if image_data:
+                # Unrecognised format: re-encode it rather than mislabel it
+                screenshot = await asyncio.to_thread(decode_image_base64, image_data)
+            elif ctx:
                 await ctx.warning("No image data from screenshot_base64, trying fallback...")
-            screenshot = computer.screenshot()
-            from io import BytesIO
-            buffer = BytesIO()
-            screenshot.save(buffer, format="JPEG")
-            image_data = base64.b64encode(buffer.getvalue()).decode("utf-8")
         
-        return {"image": image_data}
+        format = format or "jpeg"
+        if screenshot is None:
+            screenshot = await asyncio.to_thread(computer.screenshot)
+        # Drop alpha/palette once up front; JPEG cannot store it, and raw and
+        # tile encoders then work on a 3-byte-per-pixel buffer.
+        if screenshot.mode != "RGB":
+            screenshot = await asyncio.to_thread(screenshot.convert, "RGB")
+        if max_dim is not None:
+            screenshot = await asyncio.to_thread(downscale, screenshot, max_dim)
+        
+        if delta:
+            return await asyncio.to_thread(
+                encode_delta, screenshot, session_id or registry.default_session, format, options, keyframe
+            )
+        
+        if format == "lz4_raw":
+            return {
+                "image": await asyncio.to_thread(compress_raw_base64, screenshot),
+                "format": format,
+                "width": screenshot.width,
+                "height": screenshot.height
+            }
+        
+        image_data = await asyncio.to_thread(encode_image_base64, screenshot, format, **options)
+        return ImageContent(type="image", data=image_data, mimeType=f"image/{format}")
     except Exception as e:
         if ctx:
             await ctx.error(f"Screenshot failed: {str(e)}")
@@ -128,146 +447,105 @@ async def get_screenshot(session_id: Optional[str] = None, ctx: Optional[Context
 async def left_click(x: int, y: int, session_id: Optional[str] = None, ctx: Optional[Context] = None) -> str:
     """Perform a left mouse click at the specified coordinates."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Left-clicking at ({x}, {y})")
-    
-    try:
-        computer.left_click(x, y)
-        return f"Left-clicked at ({x}, {y})"
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Left-click failed: {str(e)}")
-        raise ValueError(f"Left-click failed: {str(e)}")
+    await run_action(ctx, f"Left-clicking at ({x}, {y})", "Left-click failed", computer.left_click, x, y, log=log_debug)
+    return f"Left-clicked at ({x}, {y})"
 
 @mcp.tool()
 async def right_click(x: int, y: int, session_id: Optional[str] = None, ctx: Optional[Context] = None) -> str:
     """Perform a right mouse click at the specified coordinates."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Right-clicking at ({x}, {y})")
-    
-    try:
-        computer.right_click(x, y)
-        return f"Right-clicked at ({x}, {y})"
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Right-click failed: {str(e)}")
-        raise ValueError(f"Right-click failed: {str(e)}")
+    await run_action(ctx, f"Right-clicking at ({x}, {y})", "Right-click failed", computer.right_click, x, y, log=log_debug)
+    return f"Right-clicked at ({x}, {y})"
 
 @mcp.tool()
 async def double_click(x: int, y: int, session_id: Optional[str] = None, ctx: Optional[Context] = None) -> str:
     """Perform a double click at the specified coordinates."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Double-clicking at ({x}, {y})")
-    
-    try:
-        computer.double_click(x, y)
-        return f"Double-clicked at ({x}, {y})"
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Double-click failed: {str(e)}")
-        raise ValueError(f"Double-click failed: {str(e)}")
+    await run_action(ctx, f"Double-clicking at ({x}, {y})", "Double-click failed", computer.double_click, x, y, log=log_debug)
+    return f"Double-clicked at ({x}, {y})"
 
 @mcp.tool()
 async def scroll(direction: str = "down", amount: int = 1, session_id: Optional[str] = None, ctx: Optional[Context] = None) -> str:
     """Scroll in the specified direction and amount."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Scrolling {direction} by {amount}")
-    
-    try:
-        computer.scroll(direction, amount)
-        return f"Scrolled {direction} by {amount}"
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Scroll failed: {str(e)}")
-        raise ValueError(f"Scroll failed: {str(e)}")
+    await run_action(ctx, f"Scrolling {direction} by {amount}", "Scroll failed", computer.scroll, direction, amount, log=log_debug)
+    return f"Scrolled {direction} by {amount}"
 
 @mcp.tool()
 async def type_text(text: str, session_id: Optional[str] = None, ctx: Optional[Context] = None) -> str:
     """Type the specified text into the virtual computer."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Typing text: {text[:50]}{'...' if len(text) > 50 else ''}")
-    
-    try:
-        computer.type(text)
-        return f"Typed: {text}"
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Type text failed: {str(e)}")
-        raise ValueError(f"Type text failed: {str(e)}")
+    await run_action(ctx, f"Typing text: {truncate(text, 50)}", "Type text failed", computer.type, text)
+    return f"Typed: {text}"
 
 @mcp.tool()
 async def press_key(key: str, session_id: Optional[str] = None, ctx: Optional[Context] = None) -> str:
     """Press a key or key combination (e.g., 'Enter', 'ctrl+c')."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Pressing key: {key}")
-    
-    try:
-        computer.key(key)
-        return f"Pressed key: {key}"
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Key press failed: {str(e)}")
-        raise ValueError(f"Key press failed: {str(e)}")
+    await run_action(ctx, f"Pressing key: {key}", "Key press failed", computer.key, key)
+    return f"Pressed key: {key}"
+
+def perform_actions(computer, actions: List[Action]) -> None:
+    """Run a list of input actions in order, stopping at the first failure."""
+    for index, action in enumerate(actions):
+        try:
+            action.perform(computer)
+        except Exception as e:
+            raise ValueError(f"action {index} ({action.type}): {str(e)}")
 
 @mcp.tool()
-async def wait(seconds: float, session_id: Optional[str] = None, ctx: Optional[Context] = None) -> str:
-    """Wait for the specified number of seconds."""
+async def action_sequence(
+    actions: List[Action],
+    session_id: Optional[str] = None,
+    ctx: Optional[Context] = None
+) -> str:
+    """Perform several input actions in order with a single tool call.
+
+    e.g. [{"type": "click", "x": 100, "y": 200}, {"type": "type", "text": "hi"},
+    {"type": "key", "key": "Enter"}]
+    """
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Waiting for {seconds} seconds")
+    await run_action(ctx, f"Performing {len(actions)} actions", "Action sequence failed", perform_actions, computer, actions)
+    return f"Performed {len(actions)} actions"
+
+MAX_WAIT_SECONDS = 300
+
+@mcp.tool()
+async def wait(
+    seconds: Annotated[float, Field(ge=0, le=MAX_WAIT_SECONDS)],
+    session_id: Optional[str] = None,
+    ctx: Optional[Context] = None
+) -> str:
+    """Wait for the specified number of seconds (0 to 300)."""
+    registry.get(session_id)
+    await log_info(ctx, f"Waiting for {seconds} seconds")
     
-    try:
-        computer.wait(seconds)
-        return f"Waited for {seconds} seconds"
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Wait failed: {str(e)}")
-        raise ValueError(f"Wait failed: {str(e)}")
+    # The remote wait is a plain delay, so sleep locally without holding a
+    # worker thread or an HTTP request open; sub-50ms waits are no-ops.
+    if seconds >= 0.05:
+        await asyncio.sleep(seconds)
+    return f"Waited for {seconds} seconds"
 
 @mcp.tool()
 async def execute_bash(command: str, session_id: Optional[str] = None, ctx: Optional[Context] = None) -> str:
     """Execute a bash command on the virtual computer."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Executing bash command: {command}")
-    
-    try:
-        output = computer.bash(command)
-        return output
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Bash command failed: {str(e)}")
-        raise ValueError(f"Bash command failed: {str(e)}")
+    return await run_action(ctx, f"Executing bash command: {command}", "Bash command failed", computer.bash, command)
 
 @mcp.tool()
 async def restart_computer(session_id: Optional[str] = None, ctx: Optional[Context] = None) -> Dict[str, Any]:
     """Restart the virtual computer."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info("Restarting computer...")
-    
-    try:
-        result = computer.restart()
-        return result
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Restart failed: {str(e)}")
-        raise ValueError(f"Restart failed: {str(e)}")
+    return await run_action(ctx, "Restarting computer...", "Restart failed", computer.restart)
 
 @mcp.tool()
 async def shutdown_computer(session_id: Optional[str] = None, ctx: Optional[Context] = None) -> Dict[str, Any]:
     """Shutdown and terminate the virtual computer instance."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info("Shutting down computer...")
+    await log_info(ctx, "Shutting down computer...")
     
     try:
-        result = computer.shutdown()
+        result = await asyncio.to_thread(computer.shutdown)
         registry.remove(session_id)
         return result
     except Exception as api_err:
@@ -282,22 +560,12 @@ async def shutdown_computer(session_id: Optional[str] = None, ctx: Optional[Cont
 async def get_status(session_id: Optional[str] = None, ctx: Optional[Context] = None) -> Dict[str, Any]:
     """Get the current status of the virtual computer."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info("Getting computer status...")
-    
-    try:
-        status = computer.status()
-        return status
-    except Exception as e:
-        if ctx:
-            await ctx.error(f"Status check failed: {str(e)}")
-        raise ValueError(f"Status check failed: {str(e)}")
+    return await run_action(ctx, "Getting computer status...", "Status check failed", computer.status)
 
 @mcp.tool()
-async def list_sessions(ctx: Optional[Context] = None) -> Dict[str, List[str]]:
+async def list_sessions(ctx: Optional[Context] = None) -> Dict[str, Tuple[str, ...]]:
     """List all active computer sessions."""
-    if ctx:
-        await ctx.info("Listing all active sessions...")
+    await log_info(ctx, "Listing all active sessions...")
     
     try:
         sessions = registry.list_sessions()
@@ -318,14 +586,14 @@ async def prompt(
 ) -> Dict[str, Any]:
     """Control the computer with natural language using an AI agent."""
     computer = registry.get(session_id)
-    if ctx:
-        await ctx.info(f"Executing prompt: {instruction[:100]}{'...' if len(instruction) > 100 else ''}")
+    await log_info(ctx, f"Executing prompt: {truncate(instruction, 100)}")
     
-    if provider == "anthropic" and not os.environ.get("ANTHROPIC_API_KEY"):
+    if provider == "anthropic" and not ANTHROPIC_KEY_PRESENT:
         raise ValueError("Anthropic API key required but not provided")
     
     try:
-        result = computer.prompt(
+        result = await asyncio.to_thread(
+            computer.prompt,
             instruction=instruction,
             provider=provider,
             model=model,
@@ -343,21 +611,19 @@ async def prompt(
         raise ValueError(f"Prompt execution failed: {str(e)}")
 
 # Resources
+SERVER_INFO = {
+    "name": "Orgo MCP",
+    "description": "MCP interface for controlling virtual computers",
+    "version": "1.0.0"
+}
+
 @mcp.resource("computer://server/info")
 def server_info() -> Dict[str, Any]:
     """Information about the Orgo MCP server."""
-    return {
-        "name": "Orgo MCP",
-        "description": "MCP interface for controlling virtual computers",
-        "version": "1.0.0",
-        "active_sessions": len(registry.computers)
-    }
+    return {**SERVER_INFO, "active_sessions": len(registry.computers)}
 
 # Prompts
-@mcp.prompt()
-def desktop_guidelines() -> str:
-    """Guidelines for interacting with the Ubuntu desktop environment."""
-    return """# Ubuntu Desktop Interaction Guidelines
+DESKTOP_GUIDELINES = """# Ubuntu Desktop Interaction Guidelines
 
 ## Essential Desktop Actions
 * **Opening applications/files**: ALWAYS use DOUBLE-CLICK rather than single-click
@@ -379,6 +645,11 @@ def desktop_guidelines() -> str:
 * For long operations, consider the wait function
 """
 
+@mcp.prompt()
+def desktop_guidelines() -> str:
+    """Guidelines for interacting with the Ubuntu desktop environment."""
+    return DESKTOP_GUIDELINES
+
 if __name__ == "__main__":
     mcp.run()
     # mcp.run(transport="streamable-http", host="127.0.0.1", port=8000)
\ No newline at end of file